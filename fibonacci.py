@@ -1,10 +1,24 @@
 import timeit
+from array import array
 from functools import lru_cache
+from itertools import cycle
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional: the compiled reference is skipped
+    njit = None
+
+try:
+    import splay_tree as cy_splay  # Cython build: cythonize -i splay_tree.pyx
+except ImportError:  # extension not built: the Cython series is skipped
+    cy_splay = None
+
 # --- Splay Tree Implementation ---
 
 class SplayNode:
+    __slots__ = ('key', 'value', 'left', 'right')
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
@@ -15,51 +29,53 @@ class SplayTree:
     def __init__(self):
         self.root = None
 
-    def _right_rotate(self, x):
-        y = x.left
-        x.left = y.right
-        y.right = x
-        return y
-
-    def _left_rotate(self, x):
-        y = x.right
-        x.right = y.left
-        y.left = x
-        return y
-
     def _splay(self, root, key):
-        if root is None or root.key == key:
+        if root is None:
             return root
 
-        # Key lies in left subtree
-        if key < root.key:
-            if root.left is None:
-                return root
-            # Zig-Zig (Left Left)
-            if key < root.left.key:
-                root.left.left = self._splay(root.left.left, key)
-                root = self._right_rotate(root)
-            # Zig-Zag (Left Right)
-            elif key > root.left.key:
-                root.left.right = self._splay(root.left.right, key)
-                if root.left.right:
-                    root.left = self._left_rotate(root.left)
-            return root if root.left is None else self._right_rotate(root)
+        # Top-down splay: header.right collects the left tree,
+        # header.left collects the right tree
+        header = SplayNode(None, None)
+        left_max = right_min = header
 
-        else:
-            # Key lies in right subtree
-            if root.right is None:
-                return root
-            # Zag-Zig (Right Left)
-            if key < root.right.key:
-                root.right.left = self._splay(root.right.left, key)
-                if root.right.left:
-                    root.right = self._right_rotate(root.right)
-            # Zag-Zag (Right Right)
-            elif key > root.right.key:
-                root.right.right = self._splay(root.right.right, key)
-                root = self._left_rotate(root)
-            return root if root.right is None else self._left_rotate(root)
+        while root.key != key:
+            if key < root.key:
+                y = root.left
+                if y is None:
+                    break
+                # Zig-Zig (Left Left): rotate right first
+                if key < y.key:
+                    root.left = y.right
+                    y.right = root
+                    root = y
+                    if root.left is None:
+                        break
+                # Link root into the right tree
+                right_min.left = root
+                right_min = root
+                root = root.left
+            else:
+                y = root.right
+                if y is None:
+                    break
+                # Zag-Zag (Right Right): rotate left first
+                if key > y.key:
+                    root.right = y.left
+                    y.left = root
+                    root = y
+                    if root.right is None:
+                        break
+                # Link root into the left tree
+                left_max.right = root
+                left_max = root
+                root = root.right
+
+        # Assemble the left, middle and right trees
+        left_max.right = root.left
+        right_min.left = root.right
+        root.left = header.right
+        root.right = header.left
+        return root
 
     def insert(self, key, value):
         if self.root is None:
@@ -92,6 +108,108 @@ class SplayTree:
             return self.root.value
         return None
 
+# --- Pooled Splay Tree (parallel arrays instead of node objects) ---
+
+NIL = -1
+
+class PooledSplayTree:
+    def __init__(self):
+        # Node i is (keys[i], values[i], left[i], right[i]); NIL marks no child.
+        # Slot 0 is reserved as the header node used by _splay.
+        self.keys = array('q', [0])
+        self.values = [None]
+        self.left = array('i', [NIL])
+        self.right = array('i', [NIL])
+        self.root = NIL
+
+    def _new_node(self, key, value):
+        # Nodes are never deleted, so a bump allocator is enough
+        self.keys.append(key)
+        self.values.append(value)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        return len(self.values) - 1
+
+    def _splay(self, root, key):
+        if root == NIL:
+            return root
+
+        keys, left, right = self.keys, self.left, self.right
+        # Top-down splay around header slot 0, as in SplayTree._splay
+        left[0] = right[0] = NIL
+        left_max = right_min = 0
+
+        while keys[root] != key:
+            if key < keys[root]:
+                y = left[root]
+                if y == NIL:
+                    break
+                # Zig-Zig (Left Left): rotate right first
+                if key < keys[y]:
+                    left[root] = right[y]
+                    right[y] = root
+                    root = y
+                    if left[root] == NIL:
+                        break
+                # Link root into the right tree
+                left[right_min] = root
+                right_min = root
+                root = left[root]
+            else:
+                y = right[root]
+                if y == NIL:
+                    break
+                # Zag-Zag (Right Right): rotate left first
+                if key > keys[y]:
+                    right[root] = left[y]
+                    left[y] = root
+                    root = y
+                    if right[root] == NIL:
+                        break
+                # Link root into the left tree
+                right[left_max] = root
+                left_max = root
+                root = right[root]
+
+        # Assemble the left, middle and right trees
+        right[left_max] = left[root]
+        left[right_min] = right[root]
+        left[root] = right[0]
+        right[root] = left[0]
+        return root
+
+    def insert(self, key, value):
+        if self.root == NIL:
+            self.root = self._new_node(key, value)
+            return
+
+        root = self._splay(self.root, key)
+
+        if self.keys[root] == key:
+            # Update value if key exists
+            self.values[root] = value
+            self.root = root
+            return
+
+        node = self._new_node(key, value)
+        left, right = self.left, self.right
+
+        if key < self.keys[root]:
+            right[node] = root
+            left[node] = left[root]
+            left[root] = NIL
+        else:
+            left[node] = root
+            right[node] = right[root]
+            right[root] = NIL
+        self.root = node
+
+    def find(self, key):
+        root = self.root = self._splay(self.root, key)
+        if root != NIL and self.keys[root] == key:
+            return self.values[root]
+        return None
+
 # --- Fibonacci with LRU Cache ---
 
 @lru_cache(maxsize=None)
@@ -100,57 +218,165 @@ def fibonacci_lru(n):
         return n
     return fibonacci_lru(n - 1) + fibonacci_lru(n - 2)
 
+def fibonacci_lru_cold(n):
+    # Clears inside the timed call, so every run rebuilds the cache
+    fibonacci_lru.cache_clear()
+    return fibonacci_lru(n)
+
 # --- Fibonacci with Splay Tree caching ---
 
 def fibonacci_splay(n, tree):
     cached = tree.find(n)
     if cached is not None:
         return cached
+
+    # Bottom-up: no recursion, so no recursion-limit cap on n.
+    # Bind the method once instead of looking it up on every iteration
+    insert = tree.insert
+    a, b = 0, 1
+    insert(0, a)
+    insert(1, b)
     if n <= 1:
-        tree.insert(n, n)
         return n
-    val = fibonacci_splay(n-1, tree) + fibonacci_splay(n-2, tree)
-    tree.insert(n, val)
-    return val
+    for i in range(2, n + 1):
+        a, b = b, a + b
+        insert(i, b)
+    return b
+
+def fibonacci_splay_cold(n):
+    # Fresh tree inside the timed call, so every run pays all the inserts
+    return fibonacci_splay(n, SplayTree())
+
+def fibonacci_splay_pooled_cold(n):
+    # Same for the pooled tree: every run allocates its nodes again
+    return fibonacci_splay(n, PooledSplayTree())
+
+def fibonacci_splay_cython_cold(n):
+    # Same for the Cython build (only called when the extension is available)
+    return cy_splay.fibonacci_splay(n, cy_splay.SplayTree())
+
+# --- Fibonacci with plain dict caching (baseline) ---
+
+def fibonacci_dict(n, cache):
+    cached = cache.get(n)
+    if cached is not None:
+        return cached
+
+    # Indices are filled strictly in order, so a dict gives O(1) get/put
+    a, b = 0, 1
+    cache[0] = a
+    cache[1] = b
+    if n <= 1:
+        return n
+    for i in range(2, n + 1):
+        a, b = b, a + b
+        cache[i] = b
+    return b
+
+def fibonacci_dict_cold(n):
+    # Fresh dict inside the timed call, so every run fills it again
+    return fibonacci_dict(n, {})
+
+# --- Iterative Fibonacci without cache (lower bound) ---
+
+def fib_iter(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+# --- Compiled reference (optional, requires numba) ---
+
+if njit is not None:
+    @njit(cache=True)
+    def fib_numba(n):
+        # float64 keeps the loop native: exact up to F(78), approximate
+        # beyond, so this series is a timing reference only
+        a, b = 0.0, 1.0
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+else:
+    fib_numba = None
 
 # --- Measurement ---
 
-def measure_time(func, *args, repeats=5):
+REPEATS = 7  # Timed repeats per measurement; the best one is reported
+
+def measure_time(func, *args, repeats=REPEATS, target=0.005):
     timer = timeit.Timer(lambda: func(*args))
-    times = timer.repeat(repeat=repeats, number=1)
-    return sum(times) / len(times)
+    # Calibrate from a single call: enough loops for ~5 ms per repeat keeps
+    # fast calls well above timer overhead, and slow calls get number=1.
+    # The calibration call fills any cache passed in args, so the repeats
+    # time lookups only; cold timings need a callable that builds its own cache
+    single = timer.timeit(number=1)
+    number = max(1, int(target / max(single, 1e-9)))
+    times = timer.repeat(repeat=repeats, number=number)
+    # Best of the repeats: noise only ever adds time
+    return min(times) / number
 
 def main():
     ns = list(range(0, 351, 50))  # Зменшено максимум n до 350
 
-    lru_times = []
-    splay_times = []
+    labels = ['LRU Cache (cold)', 'LRU Cache (warm)',
+              'Splay Tree (cold)', 'Splay Tree (warm)',
+              'Splay Tree (pooled, cold)', 'Splay Tree (pooled, warm)',
+              'Dict (baseline, cold)', 'Dict (baseline, warm)', 'Iterative (no cache)']
+    if fib_numba is not None:
+        fib_numba(1)  # Compile outside the timed loop
+        labels.append('Numba (compiled loop)')
+    if cy_splay is not None:
+        labels += ['Splay Tree (Cython, cold)', 'Splay Tree (Cython, warm)']
+    series = {label: {} for label in labels}  # label -> {n: time}
 
-    for n in ns:
-        fibonacci_lru.cache_clear()
-        t_lru = measure_time(fibonacci_lru, n)
+    # Warm series: one cache per approach for the whole sweep. Largest n goes
+    # first and fills it, so every smaller n measures pure lookup cost.
+    fibonacci_lru.cache_clear()
+    tree = SplayTree()
+    pooled_tree = PooledSplayTree()
+    dict_cache = {}
+    cy_tree = cy_splay.SplayTree() if cy_splay is not None else None
+
+    for n in reversed(ns):
+        series['LRU Cache (cold)'][n] = measure_time(fibonacci_lru_cold, n)
+        # The cold run leaves F(0)..F(n) cached, so this one is all hits
+        series['LRU Cache (warm)'][n] = measure_time(fibonacci_lru, n)
 
-        tree = SplayTree()
-        t_splay = measure_time(fibonacci_splay, n, tree)
+        series['Splay Tree (cold)'][n] = measure_time(fibonacci_splay_cold, n)
+        series['Splay Tree (warm)'][n] = measure_time(fibonacci_splay, n, tree)
+        series['Splay Tree (pooled, cold)'][n] = measure_time(fibonacci_splay_pooled_cold, n)
+        series['Splay Tree (pooled, warm)'][n] = measure_time(fibonacci_splay, n, pooled_tree)
 
-        lru_times.append(t_lru)
-        splay_times.append(t_splay)
+        series['Dict (baseline, cold)'][n] = measure_time(fibonacci_dict_cold, n)
+        series['Dict (baseline, warm)'][n] = measure_time(fibonacci_dict, n, dict_cache)
+        series['Iterative (no cache)'][n] = measure_time(fib_iter, n)
 
-        print(f"n={n:<4} | LRU time: {t_lru:.8f} s | Splay time: {t_splay:.8f} s")
+        if fib_numba is not None:
+            series['Numba (compiled loop)'][n] = measure_time(fib_numba, n)
+
+        if cy_splay is not None:
+            series['Splay Tree (Cython, cold)'][n] = measure_time(fibonacci_splay_cython_cold, n)
+            series['Splay Tree (Cython, warm)'][n] = measure_time(cy_splay.fibonacci_splay, n, cy_tree)
+
+        print(f"n={n:<4} | " + " | ".join(f"{label}: {times[n]:.8f} s" for label, times in series.items()))
 
     # --- Print formatted table ---
-    print("\n{:<10} {:<20} {:<20}".format("n", "LRU Cache Time (s)", "Splay Tree Time (s)"))
-    print("-" * 50)
-    for n, t_lru, t_splay in zip(ns, lru_times, splay_times):
-        print(f"{n:<10} {t_lru:<20.8f} {t_splay:<20.8f}")
+    headers = [label + ' Time (s)' for label in labels]
+    width = max(len(header) for header in headers) + 2  # Two spaces between columns
+    print("\n{:<10}".format("n") + "".join(f"{header:<{width}}" for header in headers))
+    print("-" * (10 + width * len(headers)))
+    for n in ns:
+        print(f"{n:<10}" + "".join(f"{series[label][n]:<{width}.8f}" for label in labels))
 
     # --- Plotting ---
 
     plt.figure(figsize=(12, 6))
-    plt.plot(ns, lru_times, 'o-', label='LRU Cache')
-    plt.plot(ns, splay_times, 's-', label='Splay Tree')
+    for (label, times), marker in zip(series.items(), cycle('os^dvx*p<>hD')):
+        # Warm (lookup-only) series dashed, cold and uncached series solid
+        style = '--' if label.endswith('warm)') else '-'
+        plt.plot(ns, [times[n] for n in ns], marker + style, label=label)
     plt.xlabel('n (Fibonacci number index)')
-    plt.ylabel('Average Execution Time (seconds)')
+    plt.ylabel(f'Execution Time per Call, best of {REPEATS} (seconds)')
     plt.title('Fibonacci Calculation Time: LRU Cache vs Splay Tree')
     plt.legend()
     plt.grid(True)
@@ -0,0 +1,122 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Cython build of the Splay Tree cache from fibonacci.py.
+Same top-down splay, but nodes are cdef classes with typed slots
+and all tree operations are compiled to C.
+
+Build in place with:
+    cythonize -i splay_tree.pyx
+"""
+
+cdef class SplayNode:
+    cdef public long long key
+    cdef public object value
+    cdef public SplayNode left
+    cdef public SplayNode right
+
+    def __init__(self, long long key, value):
+        self.key = key
+        self.value = value
+
+
+cdef class SplayTree:
+    cdef public SplayNode root
+
+    cdef SplayNode _splay(self, SplayNode root, long long key):
+        cdef SplayNode header, left_max, right_min, y
+        if root is None:
+            return root
+
+        # Top-down splay: header.right collects the left tree,
+        # header.left collects the right tree
+        header = SplayNode.__new__(SplayNode)
+        left_max = right_min = header
+
+        while root.key != key:
+            if key < root.key:
+                y = root.left
+                if y is None:
+                    break
+                # Zig-Zig (Left Left): rotate right first
+                if key < y.key:
+                    root.left = y.right
+                    y.right = root
+                    root = y
+                    if root.left is None:
+                        break
+                # Link root into the right tree
+                right_min.left = root
+                right_min = root
+                root = root.left
+            else:
+                y = root.right
+                if y is None:
+                    break
+                # Zag-Zag (Right Right): rotate left first
+                if key > y.key:
+                    root.right = y.left
+                    y.left = root
+                    root = y
+                    if root.right is None:
+                        break
+                # Link root into the left tree
+                left_max.right = root
+                left_max = root
+                root = root.right
+
+        # Assemble the left, middle and right trees
+        left_max.right = root.left
+        right_min.left = root.right
+        root.left = header.right
+        root.right = header.left
+        return root
+
+    cpdef insert(self, long long key, value):
+        cdef SplayNode node
+        if self.root is None:
+            self.root = SplayNode(key, value)
+            return
+
+        self.root = self._splay(self.root, key)
+
+        if self.root.key == key:
+            # Update value if key exists
+            self.root.value = value
+            return
+
+        node = SplayNode(key, value)
+
+        if key < self.root.key:
+            node.right = self.root
+            node.left = self.root.left
+            self.root.left = None
+            self.root = node
+        else:
+            node.left = self.root
+            node.right = self.root.right
+            self.root.right = None
+            self.root = node
+
+    cpdef find(self, long long key):
+        self.root = self._splay(self.root, key)
+        if self.root is not None and self.root.key == key:
+            return self.root.value
+        return None
+
+
+cpdef fibonacci_splay(long long n, SplayTree tree):
+    cdef long long i
+    cached = tree.find(n)
+    if cached is not None:
+        return cached
+
+    # Values stay Python ints: F(n) overflows 64 bits past n = 92
+    a, b = 0, 1
+    tree.insert(0, a)
+    tree.insert(1, b)
+    if n <= 1:
+        return n
+    for i in range(2, n + 1):
+        a, b = b, a + b
+        tree.insert(i, b)
+    return b